@@ -4,6 +4,8 @@ Main entry point for the Kropki Sudoku solver.
 """
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # Add project root to Python path
@@ -19,15 +21,24 @@ from src.utils.io_handler import load_puzzle, save_solution
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
+setup_logger("src")  # Solver and validator loggers propagate here (also in worker processes)
 
-def process_file(input_file: Path, solver: KropkiSolver, use_forward_checking: bool) -> None:
-    """Process a single input file."""
+def output_dir_name(solver: KropkiSolver) -> str:
+    """Name of the output directory for the solver's inference mode."""
+    if solver.use_arc_consistency:
+        return "arc_consistency"
+    if solver.use_forward_checking:
+        return "forward_checking"
+    return "basic"
+
+def process_file(input_file: Path, solver: KropkiSolver) -> bool:
+    """Process a single input file. Returns True if the puzzle was solved and saved."""
     logger.separator()
     logger.info(f"Processing {input_file.name}")
     logger.info(f"Loading puzzle from {input_file}")
     
     # Create output directories if they don't exist
-    output_base = Path("output") / ("basic" if not use_forward_checking else "forward_checking")
+    output_base = Path("output") / output_dir_name(solver)
     output_base.mkdir(parents=True, exist_ok=True)
     
     # Extract number from input filename (e.g., "1" from "Input1.txt")
@@ -62,6 +73,12 @@ def main():
     parser = argparse.ArgumentParser(description="Kropki Sudoku Solver")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument("--forward-checking", action="store_true", help="Use forward checking")
+    parser.add_argument("--arc-consistency", action="store_true", help="Use AC-3 arc consistency as inference")
+    parser.add_argument("--lcv", action="store_true", help="Order values by least-constraining value")
+    parser.add_argument("--jit", action="store_true", help="Use the Numba-compiled solver core")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of puzzles solved in parallel (default: 1 = serial; "
+                             "log lines of parallel puzzles interleave)")
     args = parser.parse_args()
     
     # Update logging level based on verbosity
@@ -70,7 +87,12 @@ def main():
     
     # Initialize solver
     logger.info(f"Initializing solver{' with forward checking' if args.forward_checking else ''}")
-    solver = KropkiSolver(forward_checking=args.forward_checking)
+    try:
+        solver = KropkiSolver(forward_checking=args.forward_checking, jit=args.jit,
+                              arc_consistency=args.arc_consistency, lcv=args.lcv)
+    except (ValueError, ImportError) as e:
+        logger.error(str(e))
+        return 1
     
     # Process all input files
     data_dir = Path("data")
@@ -85,12 +107,16 @@ def main():
         
     logger.info(f"Found {len(input_files)} input files to process")
     
-    # Process each input file
-    for input_file in input_files:
-        process_file(input_file, solver, args.forward_checking)
+    # Process each input file; puzzles are independent, so --workers can solve them in parallel
+    workers = max(1, min(args.workers or 1, len(input_files)))
+    if workers == 1:
+        results = [process_file(input_file, solver) for input_file in input_files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(partial(process_file, solver=solver), input_files))
 
     logger.separator()
-    logger.info("All puzzles processed")
+    logger.info(f"All puzzles processed: {sum(results)}/{len(results)} solved")
     return 0
 
 if __name__ == "__main__":
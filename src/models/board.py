@@ -1,20 +1,40 @@
 """
 Board model for Kropki Sudoku.
 """
-import numpy as np
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 
 from src.utils.constants import (
-    GRID_SIZE, BLOCK_SIZE, EMPTY_CELL,
+    GRID_SIZE, BLOCK_SIZE, EMPTY_CELL, CELL_COUNT, ALL_DIGITS_MASK, PEERS,
     MIN_VALUE, MAX_VALUE, NO_DOT, WHITE_DOT, BLACK_DOT
 )
 
+# Dot layout of a board without dots: every orthogonal neighbor maps to NO_DOT
+_EMPTY_DOT_EDGES = [
+    {neighbor: NO_DOT
+     for neighbor in (idx - GRID_SIZE, idx - 1, idx + 1, idx + GRID_SIZE)
+     if abs(neighbor // GRID_SIZE - idx // GRID_SIZE) + abs(neighbor % GRID_SIZE - idx % GRID_SIZE) == 1
+     and 0 <= neighbor < CELL_COUNT}
+    for idx in range(CELL_COUNT)
+]
+
 class Board:
     def __init__(self):
         """Initialize an empty Kropki Sudoku board."""
-        self.grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=int)
-        self.horizontal_dots = np.zeros((GRID_SIZE, GRID_SIZE-1), dtype=int)  # 0: no dot, 1: white, 2: black
-        self.vertical_dots = np.zeros((GRID_SIZE-1, GRID_SIZE), dtype=int)
+        self.grid = [EMPTY_CELL] * CELL_COUNT  # Flat row-major grid
+        # Used-digit bitmasks per row, column and block (bit v set = digit v present)
+        self.row_mask = [0] * GRID_SIZE
+        self.col_mask = [0] * GRID_SIZE
+        self.block_mask = [0] * GRID_SIZE
+        # Empty-cell bitmask (bit idx set = cell idx empty)
+        self.empty_cells = (1 << CELL_COUNT) - 1
+        # Dots per cell: dot_edges[idx] maps each orthogonal neighbor's flat index to
+        # its dot value (0: no dot, 1: white, 2: black). Boards without dots share
+        # _EMPTY_DOT_EDGES; the first dot set copies it into a list owned by this
+        # board. The per-cell dicts are never mutated in place.
+        self.dot_edges: List[Dict[int, int]] = _EMPTY_DOT_EDGES
+        # Valid-value masks per flat index, filled by validators.get_valid_mask
+        # and invalidated for a cell and its peers whenever the cell changes
+        self.domain_cache: Dict[int, int] = {}
 
     def __str__(self) -> str:
         """Return a string representation of the board."""
@@ -29,7 +49,7 @@ class Board:
                 # Add vertical separator before each 3x3 block
                 if j % BLOCK_SIZE == 0 and j != 0:
                     row.append('|')
-                value = self.grid[i, j]
+                value = self.grid[i * GRID_SIZE + j]
                 row.append(str(value) if value != EMPTY_CELL else '.')
             result.append(' '.join(row))
         return '\n'.join(result)
@@ -58,7 +78,64 @@ class Board:
             raise ValueError(f"Invalid position: ({row}, {col})")
         if not self.is_valid_value(value):
             raise ValueError(f"Invalid value: {value}")
-        self.grid[row, col] = value
+        idx = row * GRID_SIZE + col
+        block = (row // BLOCK_SIZE) * BLOCK_SIZE + col // BLOCK_SIZE
+        old = self.grid[idx]
+        if old != EMPTY_CELL:
+            bit = 1 << old
+            self.row_mask[row] ^= bit
+            self.col_mask[col] ^= bit
+            self.block_mask[block] ^= bit
+            if value == EMPTY_CELL:
+                self.empty_cells |= 1 << idx
+        if value != EMPTY_CELL:
+            bit = 1 << value
+            self.row_mask[row] ^= bit
+            self.col_mask[col] ^= bit
+            self.block_mask[block] ^= bit
+            if old == EMPTY_CELL:
+                self.empty_cells &= ~(1 << idx)
+        self.grid[idx] = value
+        self.invalidate_domains(idx)
+
+    def assign_unchecked(self, idx: int, value: int) -> None:
+        """
+        Fill an empty cell by flat index without validation.
+        
+        Fast path for the solver's inner loop: the caller guarantees the cell is
+        empty and the value is a valid digit. Use set_value everywhere else.
+        """
+        row, col = divmod(idx, GRID_SIZE)
+        bit = 1 << value
+        self.row_mask[row] ^= bit
+        self.col_mask[col] ^= bit
+        self.block_mask[(row // BLOCK_SIZE) * BLOCK_SIZE + col // BLOCK_SIZE] ^= bit
+        self.grid[idx] = value
+        self.empty_cells &= ~(1 << idx)
+        self.invalidate_domains(idx)
+
+    def clear_unchecked(self, idx: int) -> None:
+        """
+        Empty a filled cell by flat index without validation.
+        
+        Counterpart of assign_unchecked; the caller guarantees the cell is filled.
+        """
+        row, col = divmod(idx, GRID_SIZE)
+        bit = 1 << self.grid[idx]
+        self.row_mask[row] ^= bit
+        self.col_mask[col] ^= bit
+        self.block_mask[(row // BLOCK_SIZE) * BLOCK_SIZE + col // BLOCK_SIZE] ^= bit
+        self.grid[idx] = EMPTY_CELL
+        self.empty_cells |= 1 << idx
+        self.invalidate_domains(idx)
+
+    def invalidate_domains(self, idx: int) -> None:
+        """Drop cached valid-value masks for a cell and all its peers."""
+        cache = self.domain_cache
+        if cache:
+            cache.pop(idx, None)
+            for peer in PEERS[idx]:
+                cache.pop(peer, None)
 
     def get_value(self, row: int, col: int) -> int:
         """
@@ -76,7 +153,7 @@ class Board:
         """
         if not self.is_valid_position(row, col):
             raise ValueError(f"Invalid position: ({row}, {col})")
-        return self.grid[row, col]
+        return self.grid[row * GRID_SIZE + col]
 
     def is_empty(self, row: int, col: int) -> bool:
         """Check if a cell is empty (contains 0)."""
@@ -93,7 +170,20 @@ class Board:
             raise ValueError(f"Invalid position: ({row}, {col})")
         return row // BLOCK_SIZE, col // BLOCK_SIZE
 
-    def get_block(self, block_row: int, block_col: int) -> np.ndarray:
+    def domain_mask(self, row: int, col: int) -> int:
+        """
+        Get the bitmask of digits not yet used in the cell's row, column and block.
+        
+        Only Sudoku constraints are considered; dot constraints are left to the
+        validators. Position is not validated.
+        
+        Returns:
+            int: Bitmask with bit v set if digit v is still available
+        """
+        block = (row // BLOCK_SIZE) * BLOCK_SIZE + col // BLOCK_SIZE
+        return ALL_DIGITS_MASK & ~(self.row_mask[row] | self.col_mask[col] | self.block_mask[block])
+
+    def get_block(self, block_row: int, block_col: int) -> List[int]:
         """
         Get a 3x3 block from the grid.
         
@@ -102,7 +192,7 @@ class Board:
             block_col: Block column index (0-2)
             
         Returns:
-            np.ndarray: 3x3 block from the grid
+            List[int]: The 9 block values in row-major order
             
         Raises:
             ValueError: If block indices are invalid
@@ -112,10 +202,11 @@ class Board:
             raise ValueError(f"Invalid block indices: ({block_row}, {block_col})")
         start_row = block_row * BLOCK_SIZE
         start_col = block_col * BLOCK_SIZE
-        return self.grid[start_row:start_row + BLOCK_SIZE, 
-                        start_col:start_col + BLOCK_SIZE]
+        return [self.grid[r * GRID_SIZE + c]
+                for r in range(start_row, start_row + BLOCK_SIZE)
+                for c in range(start_col, start_col + BLOCK_SIZE)]
 
-    def get_row(self, row: int) -> np.ndarray:
+    def get_row(self, row: int) -> List[int]:
         """
         Get a complete row from the grid.
         
@@ -124,9 +215,9 @@ class Board:
         """
         if not 0 <= row < GRID_SIZE:
             raise ValueError(f"Invalid row index: {row}")
-        return self.grid[row, :]
+        return self.grid[row * GRID_SIZE:(row + 1) * GRID_SIZE]
 
-    def get_column(self, col: int) -> np.ndarray:
+    def get_column(self, col: int) -> List[int]:
         """
         Get a complete column from the grid.
         
@@ -135,15 +226,21 @@ class Board:
         """
         if not 0 <= col < GRID_SIZE:
             raise ValueError(f"Invalid column index: {col}")
-        return self.grid[:, col]
+        return self.grid[col::GRID_SIZE]
 
     def get_empty_positions(self) -> List[Tuple[int, int]]:
         """Get all empty positions in the grid."""
-        return list(zip(*np.where(self.grid == EMPTY_CELL)))
+        positions = []
+        mask = self.empty_cells
+        while mask:
+            lsb = mask & -mask
+            positions.append(divmod(lsb.bit_length() - 1, GRID_SIZE))
+            mask ^= lsb
+        return positions
 
     def is_complete(self) -> bool:
         """Check if the board is completely filled."""
-        return EMPTY_CELL not in self.grid
+        return not self.empty_cells
 
     def get_horizontal_dot(self, row: int, col: int) -> int:
         """
@@ -158,7 +255,8 @@ class Board:
         if not self.is_valid_position(row, col):
             raise ValueError(f"Invalid position: ({row}, {col})")
         if col < GRID_SIZE - 1:
-            return self.horizontal_dots[row, col]
+            idx = row * GRID_SIZE + col
+            return self.dot_edges[idx][idx + 1]
         return NO_DOT
 
     def get_vertical_dot(self, row: int, col: int) -> int:
@@ -174,9 +272,46 @@ class Board:
         if not self.is_valid_position(row, col):
             raise ValueError(f"Invalid position: ({row}, {col})")
         if row < GRID_SIZE - 1:
-            return self.vertical_dots[row, col]
+            idx = row * GRID_SIZE + col
+            return self.dot_edges[idx][idx + GRID_SIZE]
         return NO_DOT
 
+    def get_adjacent_dots(self, row: int, col: int) -> Dict[int, int]:
+        """
+        Get the dot value toward each orthogonal neighbor of a cell.
+        
+        Returns:
+            Dict[int, int]: Dot value (including NO_DOT) keyed by the neighbor's flat index.
+                The dict is shared with the board and must not be modified.
+            
+        Raises:
+            ValueError: If position is invalid
+        """
+        if not self.is_valid_position(row, col):
+            raise ValueError(f"Invalid position: ({row}, {col})")
+        return self.dot_edges[row * GRID_SIZE + col]
+
+    def get_horizontal_dots(self) -> List[List[int]]:
+        """Get all horizontal dots as 9 rows of 8 values."""
+        return [[self.dot_edges[row * GRID_SIZE + col][row * GRID_SIZE + col + 1]
+                 for col in range(GRID_SIZE - 1)]
+                for row in range(GRID_SIZE)]
+
+    def get_vertical_dots(self) -> List[List[int]]:
+        """Get all vertical dots as 8 rows of 9 values."""
+        return [[self.dot_edges[row * GRID_SIZE + col][(row + 1) * GRID_SIZE + col]
+                 for col in range(GRID_SIZE)]
+                for row in range(GRID_SIZE - 1)]
+
+    def _set_dot(self, idx: int, neighbor: int, value: int) -> None:
+        """Set the dot between two adjacent cells, replacing (not mutating) their edge dicts."""
+        if self.dot_edges is _EMPTY_DOT_EDGES:
+            self.dot_edges = list(_EMPTY_DOT_EDGES)
+        dot_edges = self.dot_edges
+        dot_edges[idx] = {**dot_edges[idx], neighbor: value}
+        dot_edges[neighbor] = {**dot_edges[neighbor], idx: value}
+        self.invalidate_domains(idx)
+
     def set_horizontal_dot(self, row: int, col: int, value: int) -> None:
         """
         Set horizontal dot value.
@@ -194,7 +329,8 @@ class Board:
         if value not in {NO_DOT, WHITE_DOT, BLACK_DOT}:
             raise ValueError(f"Invalid dot value: {value}")
         if col < GRID_SIZE - 1:
-            self.horizontal_dots[row, col] = value
+            idx = row * GRID_SIZE + col
+            self._set_dot(idx, idx + 1, value)
 
     def set_vertical_dot(self, row: int, col: int, value: int) -> None:
         """
@@ -213,12 +349,17 @@ class Board:
         if value not in {NO_DOT, WHITE_DOT, BLACK_DOT}:
             raise ValueError(f"Invalid dot value: {value}")
         if row < GRID_SIZE - 1:
-            self.vertical_dots[row, col] = value
+            idx = row * GRID_SIZE + col
+            self._set_dot(idx, idx + GRID_SIZE, value)
 
     def copy(self) -> 'Board':
-        """Create a deep copy of the board."""
+        """Create a deep copy of the board (the immutable per-cell dot dicts are shared)."""
         new_board = Board()
         new_board.grid = self.grid.copy()
-        new_board.horizontal_dots = self.horizontal_dots.copy()
-        new_board.vertical_dots = self.vertical_dots.copy()
+        new_board.row_mask = self.row_mask.copy()
+        new_board.col_mask = self.col_mask.copy()
+        new_board.block_mask = self.block_mask.copy()
+        new_board.empty_cells = self.empty_cells
+        if self.dot_edges is not _EMPTY_DOT_EDGES:
+            new_board.dot_edges = list(self.dot_edges)
         return new_board 
\ No newline at end of file
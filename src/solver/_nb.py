@@ -0,0 +1,177 @@
+"""
+Numba-compiled backtracking core for Kropki Sudoku.
+
+Mirrors KropkiSolver's search (MRV with degree tie-break, increasing value
+order, optional forward checking) on contiguous int16 arrays using the
+bitmask board representation, so the result matches the pure Python solver.
+"""
+import numpy as np
+from numba import njit
+
+from src.utils.constants import (
+    GRID_SIZE, BLOCK_SIZE, EMPTY_CELL, ALL_DIGITS_MASK,
+    NO_DOT, PEERS, DOT_OK
+)
+
+_PEERS = np.array(PEERS, dtype=np.int64)
+_DOT_OK = np.array(DOT_OK, dtype=np.int64)
+
+@njit(cache=True, boundscheck=False)
+def popcount(mask):
+    """Count the set bits in a candidate bitmask."""
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+@njit(cache=True, boundscheck=False)
+def domain_mask(row_mask, col_mask, block_mask, r, c):
+    """Bitmask of digits not used in the row, column or block of (r, c)."""
+    b = (r // BLOCK_SIZE) * BLOCK_SIZE + c // BLOCK_SIZE
+    return ALL_DIGITS_MASK & ~(row_mask[r] | col_mask[c] | block_mask[b])
+
+@njit(cache=True, boundscheck=False)
+def dot_allowed(v1, v2, dot):
+    """Check whether two values satisfy the dot (or absence of dot) between them."""
+    if v1 == EMPTY_CELL or v2 == EMPTY_CELL:
+        return True
+    return (_DOT_OK[dot, v1] >> v2) & 1 == 1
+
+@njit(cache=True, boundscheck=False)
+def valid_mask(grid, row_mask, col_mask, block_mask, hd, vd, r, c):
+    """Bitmask of values for (r, c) satisfying both Sudoku and dot constraints."""
+    mask = domain_mask(row_mask, col_mask, block_mask, r, c)
+    result = 0
+    for v in range(1, GRID_SIZE + 1):
+        if not (mask >> v) & 1:
+            continue
+        if c > 0 and not dot_allowed(v, grid[r, c - 1], hd[r, c - 1]):
+            continue
+        if c < GRID_SIZE - 1 and not dot_allowed(v, grid[r, c + 1], hd[r, c]):
+            continue
+        if r > 0 and not dot_allowed(v, grid[r - 1, c], vd[r - 1, c]):
+            continue
+        if r < GRID_SIZE - 1 and not dot_allowed(v, grid[r + 1, c], vd[r, c]):
+            continue
+        result |= 1 << v
+    return result
+
+@njit(cache=True, boundscheck=False)
+def degree(grid, hd, vd, r, c):
+    """Number of constraints on (r, c) with unassigned cells, as in KropkiSolver.get_degree."""
+    count = 0
+    for peer in _PEERS[r * GRID_SIZE + c]:
+        if grid[peer // GRID_SIZE, peer % GRID_SIZE] == EMPTY_CELL:
+            count += 1
+    if c > 0 and grid[r, c - 1] == EMPTY_CELL and hd[r, c - 1] != NO_DOT:
+        count += 1
+    if c < GRID_SIZE - 1 and grid[r, c + 1] == EMPTY_CELL and hd[r, c] != NO_DOT:
+        count += 1
+    if r > 0 and grid[r - 1, c] == EMPTY_CELL and vd[r - 1, c] != NO_DOT:
+        count += 1
+    if r < GRID_SIZE - 1 and grid[r + 1, c] == EMPTY_CELL and vd[r, c] != NO_DOT:
+        count += 1
+    return count
+
+@njit(cache=True, boundscheck=False)
+def select_cell(grid, row_mask, col_mask, block_mask, hd, vd):
+    """Pick the next cell by MRV, breaking ties by degree. Returns -1 if none is empty."""
+    min_remaining = GRID_SIZE + 1
+    max_degree = -1
+    selected = -1
+    for r in range(GRID_SIZE):
+        for c in range(GRID_SIZE):
+            if grid[r, c] != EMPTY_CELL:
+                continue
+            size = popcount(valid_mask(grid, row_mask, col_mask, block_mask, hd, vd, r, c))
+            if size == 0:
+                return r * GRID_SIZE + c
+            if size < min_remaining:
+                min_remaining = size
+                max_degree = degree(grid, hd, vd, r, c)
+                selected = r * GRID_SIZE + c
+            elif size == min_remaining:
+                deg = degree(grid, hd, vd, r, c)
+                if deg > max_degree:
+                    max_degree = deg
+                    selected = r * GRID_SIZE + c
+    return selected
+
+@njit(cache=True, boundscheck=False)
+def inference(grid, row_mask, col_mask, block_mask, hd, vd, r, c):
+    """Forward check: False if any empty peer of (r, c) is left without values."""
+    for peer in _PEERS[r * GRID_SIZE + c]:
+        pr = peer // GRID_SIZE
+        pc = peer % GRID_SIZE
+        if grid[pr, pc] == EMPTY_CELL:
+            if valid_mask(grid, row_mask, col_mask, block_mask, hd, vd, pr, pc) == 0:
+                return False
+    return True
+
+@njit(cache=True, boundscheck=False)
+def _toggle(row_mask, col_mask, block_mask, r, c, v):
+    """Flip digit v in the masks of (r, c)."""
+    bit = 1 << v
+    b = (r // BLOCK_SIZE) * BLOCK_SIZE + c // BLOCK_SIZE
+    row_mask[r] ^= bit
+    col_mask[c] ^= bit
+    block_mask[b] ^= bit
+
+@njit(cache=True, boundscheck=False)
+def solve(grid, row_mask, col_mask, block_mask, hd, vd, forward_checking):
+    """
+    Iterative backtracking search; grid and masks are updated in place.
+
+    Returns:
+        (solved, assignments, backtracks)
+    """
+    assignments = 0
+    backtracks = 0
+    cells = np.empty(GRID_SIZE * GRID_SIZE, dtype=np.int64)
+    remaining = np.empty(GRID_SIZE * GRID_SIZE, dtype=np.int64)
+
+    cell = select_cell(grid, row_mask, col_mask, block_mask, hd, vd)
+    if cell < 0:
+        return True, assignments, backtracks
+    depth = 0
+    cells[0] = cell
+    remaining[0] = valid_mask(grid, row_mask, col_mask, block_mask, hd, vd,
+                              cell // GRID_SIZE, cell % GRID_SIZE)
+
+    while depth >= 0:
+        r = cells[depth] // GRID_SIZE
+        c = cells[depth] % GRID_SIZE
+
+        # Undo the value tried last time at this depth
+        if grid[r, c] != EMPTY_CELL:
+            _toggle(row_mask, col_mask, block_mask, r, c, grid[r, c])
+            grid[r, c] = EMPTY_CELL
+            backtracks += 1
+
+        rem = remaining[depth]
+        if rem == 0:
+            depth -= 1
+            continue
+        lsb = rem & -rem
+        remaining[depth] = rem ^ lsb
+        v = 0
+        while (1 << v) != lsb:
+            v += 1
+
+        grid[r, c] = v
+        _toggle(row_mask, col_mask, block_mask, r, c, v)
+        assignments += 1
+
+        if forward_checking and not inference(grid, row_mask, col_mask, block_mask, hd, vd, r, c):
+            continue
+
+        cell = select_cell(grid, row_mask, col_mask, block_mask, hd, vd)
+        if cell < 0:
+            return True, assignments, backtracks
+        depth += 1
+        cells[depth] = cell
+        remaining[depth] = valid_mask(grid, row_mask, col_mask, block_mask, hd, vd,
+                                      cell // GRID_SIZE, cell % GRID_SIZE)
+
+    return False, assignments, backtracks
@@ -1,64 +1,89 @@
 """
 Main solver implementation for Kropki Sudoku following the standard CSP backtracking algorithm.
 """
-from typing import Optional, Set, Tuple, List
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence, Tuple, List
 
-from src.utils.constants import GRID_SIZE, EMPTY_CELL, BLOCK_SIZE, NO_DOT
+from src.utils.constants import (
+    GRID_SIZE, CELL_COUNT, EMPTY_CELL, NO_DOT, PEERS, DOT_OK, ADJACENT_SUPPORT
+)
 from src.models.board import Board
-from src.utils.validators import get_valid_values, is_valid_sudoku_move, is_valid_dot_move
-from src.utils.logger import setup_logger
+from src.utils.validators import (
+    get_valid_mask, MASK_DIGITS, is_valid_sudoku_move, is_valid_dot_move
+)
 
-logger = setup_logger(__name__)
+# Configured by the application entry point (see setup_logger)
+logger = logging.getLogger(__name__)
 
 class KropkiSolver:
-    def __init__(self, forward_checking: bool = False):
-        """Initialize the Kropki Sudoku solver."""
+    def __init__(self, forward_checking: bool = False, jit: bool = False,
+                 arc_consistency: bool = False, lcv: bool = False):
+        """
+        Initialize the Kropki Sudoku solver.
+        
+        Args:
+            forward_checking: Use forward checking as the inference step
+            jit: Run the search in the Numba-compiled core (requires numba)
+            arc_consistency: Use AC-3 as the inference step (maintains pruned domains)
+            lcv: Order values by least-constraining value instead of 1-9
+            
+        Raises:
+            ValueError: If arc consistency or LCV ordering is combined with the jit core
+            ImportError: If the jit core is requested but numba is not installed
+        """
+        if jit and arc_consistency:
+            raise ValueError("Arc consistency is not supported by the jit solver core")
+        if jit and lcv:
+            raise ValueError("LCV ordering is not supported by the jit solver core")
+        if jit:
+            try:
+                from src.solver import _nb
+            except ImportError as e:
+                raise ImportError("The jit solver core requires numba "
+                                  "(pip install -r requirements-jit.txt)") from e
         self.use_forward_checking = forward_checking
+        self.use_jit = jit
+        self.use_arc_consistency = arc_consistency
+        self.use_lcv = lcv
         self.assignments = 0
         self.backtracks = 0
-        logger.info(f"Solver initialized{' with forward checking' if forward_checking else ' without forward checking'}")
+        # AC-3 state: candidate bitmask per cell, dot type per adjacent neighbor,
+        # and the trail of (cell, previous domain) changes used for undo
+        self.domains: List[int] = []
+        self.adjacent: List[Dict[int, int]] = []
+        self.trail: List[Tuple[int, int]] = []
+        if arc_consistency:
+            inference_name = ' with arc consistency'
+        elif forward_checking:
+            inference_name = ' with forward checking'
+        else:
+            inference_name = ' without forward checking'
+        logger.info(f"Solver initialized{inference_name}{' and LCV ordering' if lcv else ''}"
+                    f"{' (jit)' if jit else ''}")
 
     def get_degree(self, board: Board, row: int, col: int) -> int:
         """
         Calculate the degree (number of constraints) for a variable.
         Degree includes:
-        1. Row constraints (other empty cells in same row)
-        2. Column constraints (other empty cells in same column)
-        3. Block constraints (other empty cells in same 3x3 block)
-        4. Dot constraints (adjacent cells with dots)
+        1. Sudoku constraints (empty peers in the same row, column or 3x3 block,
+           each counted once)
+        2. Dot constraints (adjacent cells with dots)
         """
         degree = 0
+        grid = board.grid
+        empty = EMPTY_CELL
+        idx = row * GRID_SIZE + col
         
-        # Count empty cells in row
-        for c in range(GRID_SIZE):
-            if c != col and board.is_empty(row, c):
+        # Count empty peers
+        for peer in PEERS[idx]:
+            if grid[peer] == empty:
                 degree += 1
-                
-        # Count empty cells in column
-        for r in range(GRID_SIZE):
-            if r != row and board.is_empty(r, col):
-                degree += 1
-                
-        # Count empty cells in block
-        block_row, block_col = row // BLOCK_SIZE, col // BLOCK_SIZE
-        for r in range(block_row * BLOCK_SIZE, (block_row + 1) * BLOCK_SIZE):
-            for c in range(block_col * BLOCK_SIZE, (block_col + 1) * BLOCK_SIZE):
-                if (r != row or c != col) and board.is_empty(r, c):
-                    degree += 1
                     
         # Count dot constraints with adjacent cells
-        # Left neighbor
-        if col > 0 and board.is_empty(row, col-1) and board.get_horizontal_dot(row, col-1) != NO_DOT:
-            degree += 1
-        # Right neighbor
-        if col < GRID_SIZE-1 and board.is_empty(row, col+1) and board.get_horizontal_dot(row, col) != NO_DOT:
-            degree += 1
-        # Upper neighbor
-        if row > 0 and board.is_empty(row-1, col) and board.get_vertical_dot(row-1, col) != NO_DOT:
-            degree += 1
-        # Lower neighbor
-        if row < GRID_SIZE-1 and board.is_empty(row+1, col) and board.get_vertical_dot(row, col) != NO_DOT:
-            degree += 1
+        for neighbor, dot in board.dot_edges[idx].items():
+            if dot != NO_DOT and grid[neighbor] == empty:
+                degree += 1
             
         return degree
 
@@ -66,121 +91,316 @@ class KropkiSolver:
         """
         Select unassigned variable using MRV (Minimum Remaining Values) heuristic.
         Break ties using degree heuristic (most constraints).
+        
+        Domain sizes are popcounts of the candidate bitmask. The degree is only
+        computed when a cell ties the current minimum, and the scan stops early
+        on a cell with an empty domain since that branch must fail anyway.
         """
         min_remaining = float('inf')
         max_degree = -1
         selected_var = None
+        domain_mask = self.domain_mask
+        get_degree = self.get_degree
         
-        # Find all empty cells and their domains
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                if board.is_empty(row, col):
-                    # Get domain size (MRV)
-                    domain = get_valid_values(board, row, col)
-                    domain_size = len(domain)
-                    
-                    # Get degree (number of constraints)
-                    degree = self.get_degree(board, row, col)
-                    
-                    logger.debug(f"Cell ({row},{col}): domain size={domain_size}, degree={degree}")
-                    
-                    # Update selection based on MRV and degree
-                    if domain_size < min_remaining or \
-                       (domain_size == min_remaining and degree > max_degree):
-                        min_remaining = domain_size
-                        max_degree = degree
-                        selected_var = (row, col)
-        
-        if selected_var:
-            row, col = selected_var
-            logger.debug(f"Selected variable ({row},{col}) with domain size {min_remaining} and degree {max_degree}")
+        # Find all empty cells (set bits of the board's empty-cell mask) and their domains
+        empty_cells = board.empty_cells
+        while empty_cells:
+            lsb = empty_cells & -empty_cells
+            empty_cells ^= lsb
+            row, col = divmod(lsb.bit_length() - 1, GRID_SIZE)
+            # Get domain size (MRV)
+            domain_size = domain_mask(board, row, col).bit_count()
+            if domain_size == 0:
+                return (row, col)
+            
+            # Update selection based on MRV and degree
+            if domain_size < min_remaining:
+                min_remaining = domain_size
+                max_degree = get_degree(board, row, col)
+                selected_var = (row, col)
+            elif domain_size == min_remaining:
+                degree = get_degree(board, row, col)
+                if degree > max_degree:
+                    max_degree = degree
+                    selected_var = (row, col)
         
         return selected_var
 
-    def order_domain_values(self, domain: Set[int]) -> List[int]:
-        """Return domain values in their natural order (1-9)."""
-        return sorted(list(domain))
+    def order_domain_values(self, board: Board, row: int, col: int, domain: int) -> Sequence[int]:
+        """
+        Return the values of a domain bitmask in their natural order (1-9), or
+        least-constraining value first when LCV ordering is enabled.
+        
+        LCV counts, for each value, how many candidates it would remove from the
+        domains of the empty peers (the value itself, plus dot-incompatible values
+        for adjacent cells). Ties keep the natural order.
+        """
+        values = MASK_DIGITS[domain]
+        if not self.use_lcv:
+            return values
+
+        # Peer domains and dots are looked up once and shared by every value
+        grid = board.grid
+        adjacent = board.get_adjacent_dots(row, col)
+        neighbors = [
+            (self.domain_mask(board, *divmod(peer, GRID_SIZE)), adjacent.get(peer))
+            for peer in PEERS[row * GRID_SIZE + col]
+            if grid[peer] == EMPTY_CELL
+        ]
+
+        def pruned(value: int) -> int:
+            bit = 1 << value
+            count = 0
+            for mask, dot in neighbors:
+                allowed = ~bit if dot is None else DOT_OK[dot][value] & ~bit
+                count += (mask & ~allowed).bit_count()
+            return count
+
+        return sorted(values, key=pruned)
+
+    def domain_mask(self, board: Board, row: int, col: int) -> int:
+        """
+        Get the current domain of a variable as a bitmask.
+        With arc consistency this is the pruned AC-3 domain, otherwise the
+        values consistent with the current assignment.
+        """
+        if self.use_arc_consistency:
+            return self.domains[row * GRID_SIZE + col]
+        return get_valid_mask(board, row, col)
+
+    def init_domains(self, board: Board) -> bool:
+        """
+        Build the initial AC-3 domains and make every arc consistent.
+        Returns False if some domain is wiped out.
+        """
+        self.domains = [
+            1 << value if value != EMPTY_CELL else get_valid_mask(board, *divmod(idx, GRID_SIZE))
+            for idx, value in enumerate(board.grid)
+        ]
+        self.trail = []
+        self.adjacent = board.dot_edges
+        return self.ac3(deque((i, j) for i in range(CELL_COUNT) for j in PEERS[i]))
+
+    def revise(self, i: int, j: int) -> bool:
+        """
+        Remove values from the domain of cell i that have no support in cell j.
+        Returns True if the domain of i was revised.
+        """
+        domain_i = self.domains[i]
+        domain_j = self.domains[j]
+        dot = self.adjacent[i].get(j)
+        if dot is None:
+            # All-different: only a singleton neighbor removes a value
+            if domain_j & (domain_j - 1):
+                return False
+            revised = domain_i & ~domain_j
+        else:
+            # All-different plus the dot relation between adjacent cells
+            revised = domain_i & ADJACENT_SUPPORT[dot][domain_j]
+        if revised == domain_i:
+            return False
+        self.trail.append((i, domain_i))
+        self.domains[i] = revised
+        return True
+
+    def restore_domains(self, mark: int) -> None:
+        """Undo AC-3 domain changes recorded on the trail after the given mark."""
+        trail = self.trail
+        domains = self.domains
+        while len(trail) > mark:
+            idx, domain = trail.pop()
+            domains[idx] = domain
+
+    def ac3(self, queue: Deque[Tuple[int, int]]) -> bool:
+        """
+        AC-3 propagation over the given arcs (i, j).
+        Returns False if some domain becomes empty.
+        """
+        while queue:
+            i, j = queue.popleft()
+            if self.revise(i, j):
+                if self.domains[i] == 0:
+                    return False
+                for k in PEERS[i]:
+                    if k != j:
+                        queue.append((k, i))
+        return True
 
     def inference(self, board: Board, row: int, col: int) -> bool:
         """
-        Simple forward checking implementation.
+        Simple forward checking implementation, or AC-3 when arc consistency is enabled.
         Returns True if no domains are empty after inference.
         """
+        if self.use_arc_consistency:
+            idx = row * GRID_SIZE + col
+            value = board.grid[idx]
+            # Revise every arc (peer, var) directly: the assigned value leaves each
+            # peer's domain, and adjacent peers keep only DOT_OK-compatible values
+            bit = 1 << value
+            self.trail.append((idx, self.domains[idx]))
+            self.domains[idx] = bit
+            adjacent = self.adjacent[idx]
+            queue = deque()
+            for peer in PEERS[idx]:
+                domain = self.domains[peer] & ~bit
+                dot = adjacent.get(peer)
+                if dot is not None:
+                    domain &= DOT_OK[dot][value]
+                if domain != self.domains[peer]:
+                    if domain == 0:
+                        return False
+                    self.trail.append((peer, self.domains[peer]))
+                    self.domains[peer] = domain
+                    queue.extend((k, peer) for k in PEERS[peer] if k != idx)
+            return self.ac3(queue)
+
         if not self.use_forward_checking:
             return True
 
-        # Check each empty cell in the same row, column, and block
-        for i in range(GRID_SIZE):
-            # Check row
-            if i != col and board.is_empty(row, i):
-                if len(get_valid_values(board, row, i)) == 0:
-                    return False
-            # Check column
-            if i != row and board.is_empty(i, col):
-                if len(get_valid_values(board, i, col)) == 0:
+        # Check each empty peer in the same row, column, and block
+        grid = board.grid
+        for peer in PEERS[row * GRID_SIZE + col]:
+            if grid[peer] == EMPTY_CELL:
+                peer_row, peer_col = divmod(peer, GRID_SIZE)
+                if get_valid_mask(board, peer_row, peer_col) == 0:
                     return False
 
-        # Check block
-        block_row, block_col = row // BLOCK_SIZE, col // BLOCK_SIZE
-        for i in range(block_row * BLOCK_SIZE, (block_row + 1) * BLOCK_SIZE):
-            for j in range(block_col * BLOCK_SIZE, (block_col + 1) * BLOCK_SIZE):
-                if (i != row or j != col) and board.is_empty(i, j):
-                    if len(get_valid_values(board, i, j)) == 0:
-                        return False
-
         return True
 
     def backtrack(self, board: Board) -> bool:
         """
         The main backtracking algorithm.
+        
+        Runs iteratively over an explicit stack of frames
+        [row, col, remaining values, trail mark] instead of recursing once per
+        variable. The trail mark records where this frame's domain changes begin
+        so AC-3 undo only restores the cells that were actually pruned.
         """
+        # Bind hot attributes and methods to locals once
+        assign = board.assign_unchecked
+        clear = board.clear_unchecked
+        grid = board.grid
+        is_complete = board.is_complete
+        select_unassigned_variable = self.select_unassigned_variable
+        new_frame = self.new_frame
+        inference = self.inference
+        restore_domains = self.restore_domains
+        use_inference = self.use_forward_checking or self.use_arc_consistency
+        use_arc_consistency = self.use_arc_consistency
+        trail = self.trail
+        empty = EMPTY_CELL
+        assignments = 0
+        backtracks = 0
+
         # If assignment is complete then return assignment
-        if board.is_complete():
+        if is_complete():
             return True
 
         # var <- SELECT-UNASSIGNED-VARIABLE(csp, assignment)
-        var = self.select_unassigned_variable(board)
+        var = select_unassigned_variable(board)
         if not var:
             return False
-        row, col = var
+        stack = [new_frame(board, *var)]
+
+        try:
+            while stack:
+                frame = stack[-1]
+                row, col, values, mark = frame
+                idx = row * GRID_SIZE + col
+
+                # remove {var = value} and inferences from assignment
+                if grid[idx] != empty:
+                    backtracks += 1
+                    clear(idx)
+                    if use_arc_consistency:
+                        restore_domains(mark)
+
+                # for each value in ORDER-DOMAIN-VALUES(csp, var, assignment)
+                value = next(values, None)
+                if value is None:
+                    # return failure
+                    stack.pop()
+                    continue
+
+                # if value is consistent with assignment
+                if not (is_valid_sudoku_move(board, row, col, value) and is_valid_dot_move(board, row, col, value)):
+                    continue
 
-        # for each value in ORDER-DOMAIN-VALUES(csp, var, assignment)
-        domain = get_valid_values(board, row, col)
-        for value in self.order_domain_values(domain):
-            # if value is consistent with assignment
-            if is_valid_sudoku_move(board, row, col, value) and is_valid_dot_move(board, row, col, value):
                 # add {var = value} to assignment
-                board.set_value(row, col, value)
-                self.assignments += 1
-                logger.debug(f"Assigned {value} to ({row},{col})")
+                assign(idx, value)
+                assignments += 1
+                frame[3] = len(trail)
 
                 # inferences <- INFERENCE(csp, var, assignment)
-                inferences_ok = True
-                if self.use_forward_checking:
-                    inferences_ok = self.inference(board, row, col)
-
-                # if inferences != failure then
-                if inferences_ok:
-                    # result <- BACKTRACK(csp, assignment)
-                    result = self.backtrack(board)
-                    # if result != failure then return result
-                    if result:
-                        return True
+                if use_inference and not inference(board, row, col):
+                    continue
 
-                # remove {var = value} and inferences from assignment
-                self.backtracks += 1
-                board.set_value(row, col, EMPTY_CELL)
-                logger.debug(f"Backtracking from ({row},{col})")
+                # If assignment is complete then return assignment
+                if is_complete():
+                    return True
+
+                # result <- BACKTRACK(csp, assignment)
+                var = select_unassigned_variable(board)
+                if not var:
+                    continue
+                stack.append(new_frame(board, *var))
+
+            # return failure
+            return False
+        finally:
+            self.assignments += assignments
+            self.backtracks += backtracks
 
-        # return failure
-        return False
+    def new_frame(self, board: Board, row: int, col: int) -> list:
+        """Create a search frame for a variable with its ordered domain values."""
+        domain = self.domain_mask(board, row, col)
+        return [row, col, iter(self.order_domain_values(board, row, col, domain)), len(self.trail)]
 
     def backtracking_search(self, board: Board) -> bool:
         """
         Main entry point for the backtracking search algorithm.
         """
+        if self.use_arc_consistency and not self.init_domains(board):
+            return False
         return self.backtrack(board)
 
+    def jit_search(self, board: Board) -> bool:
+        """
+        Run the backtracking search in the Numba-compiled core.
+        
+        The board is packed into int16 arrays, solved in place by the jitted
+        function, and the assignment is copied back on success.
+        """
+        import numpy as np
+        from src.solver import _nb
+
+        grid = np.array(board.grid, dtype=np.int16).reshape(GRID_SIZE, GRID_SIZE)
+        row_mask = np.array(board.row_mask, dtype=np.int16)
+        col_mask = np.array(board.col_mask, dtype=np.int16)
+        block_mask = np.array(board.block_mask, dtype=np.int16)
+        hdots = np.array(board.get_horizontal_dots(), dtype=np.int16)
+        vdots = np.array(board.get_vertical_dots(), dtype=np.int16)
+
+        solved, assignments, backtracks = _nb.solve(
+            grid, row_mask, col_mask, block_mask, hdots, vdots, self.use_forward_checking
+        )
+        self.assignments += assignments
+        self.backtracks += backtracks
+
+        if solved:
+            for row in range(GRID_SIZE):
+                for col in range(GRID_SIZE):
+                    if board.is_empty(row, col):
+                        board.set_value(row, col, int(grid[row, col]))
+        return solved
+
     def solve(self, board: Board) -> bool:
         """Entry point that matches the original interface."""
-        return self.backtracking_search(board) 
\ No newline at end of file
+        self.assignments = 0
+        self.backtracks = 0
+        if self.use_jit:
+            solved = self.jit_search(board)
+        else:
+            solved = self.backtracking_search(board)
+        logger.info(f"Search finished: {self.assignments} assignments, {self.backtracks} backtracks")
+        return solved 
\ No newline at end of file
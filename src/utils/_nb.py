@@ -0,0 +1,39 @@
+"""
+Numba-compiled kernels for verifying Kropki Sudoku solutions.
+
+check_dots looks pairs up in the same DOT_OK table as the solver's kernel,
+flagging every offending pair so only those need reporting.
+"""
+import numpy as np
+from numba import njit
+
+from src.utils.constants import GRID_SIZE, MIN_VALUE, MAX_VALUE, DOT_OK
+
+_DOT_OK = np.array(DOT_OK, dtype=np.int64)
+
+@njit(cache=True, boundscheck=False)
+def pair_ok(val1, val2, dot):
+    """Check whether two solution values satisfy the dot (or absence of dot) between them."""
+    if not (MIN_VALUE <= val1 <= MAX_VALUE and MIN_VALUE <= val2 <= MAX_VALUE):
+        return False  # Not a digit; left to the per-pair checks to report
+    if dot < 0 or dot >= _DOT_OK.shape[0]:
+        return False  # Unknown dot value
+    return (_DOT_OK[dot, val1] >> val2) & 1 == 1
+
+@njit(cache=True, boundscheck=False)
+def check_dots(solution, hdots, vdots):
+    """
+    Check every dot constraint of a solved grid.
+
+    Returns:
+        (h_bad, v_bad): Boolean arrays shaped like hdots and vdots, True where violated
+    """
+    h_bad = np.zeros(hdots.shape, dtype=np.bool_)
+    v_bad = np.zeros(vdots.shape, dtype=np.bool_)
+    for r in range(GRID_SIZE):
+        for c in range(GRID_SIZE - 1):
+            h_bad[r, c] = not pair_ok(solution[r, c], solution[r, c + 1], hdots[r, c])
+    for r in range(GRID_SIZE - 1):
+        for c in range(GRID_SIZE):
+            v_bad[r, c] = not pair_ok(solution[r, c], solution[r + 1, c], vdots[r, c])
+    return h_bad, v_bad
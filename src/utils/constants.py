@@ -17,4 +17,62 @@ WHITE_DOT = 1  # Difference of 1
 BLACK_DOT = 2  # Double/half relationship
 
 # Empty cell
-EMPTY_CELL = 0 
\ No newline at end of file
+EMPTY_CELL = 0
+
+# Flat grid size
+CELL_COUNT = GRID_SIZE * GRID_SIZE
+
+# Candidate bitmasks (bit v set means digit v is available)
+ALL_DIGITS_MASK = sum(1 << v for v in VALID_DIGITS)  # 0x3FE
+BIT2DIGIT = {1 << v: v for v in VALID_DIGITS}
+
+# Units (row, column, block) and the 20 distinct peers of each cell, by flat index
+UNITS = [
+    (
+        tuple(r * GRID_SIZE + i for i in range(GRID_SIZE)),
+        tuple(i * GRID_SIZE + c for i in range(GRID_SIZE)),
+        tuple((r - r % BLOCK_SIZE + i) * GRID_SIZE + (c - c % BLOCK_SIZE + j)
+              for i in range(BLOCK_SIZE) for j in range(BLOCK_SIZE)),
+    )
+    for r in range(GRID_SIZE) for c in range(GRID_SIZE)
+]
+PEERS = [
+    tuple(sorted({idx for unit in UNITS[cell] for idx in unit} - {cell}))
+    for cell in range(CELL_COUNT)
+]
+
+# Dot compatibility: DOT_OK[dot][v] is the mask of digits w such that v and w
+# satisfy the dot between them (white: differ by 1, black: double/half,
+# no dot: neither relation holds)
+def _dot_satisfied(v: int, w: int, dot: int) -> bool:
+    white = abs(v - w) == 1
+    black = v == 2 * w or w == 2 * v
+    if dot == WHITE_DOT:
+        return white
+    if dot == BLACK_DOT:
+        return black
+    return not (white or black)
+
+DOT_OK = [
+    [sum(1 << w for w in VALID_DIGITS if v != EMPTY_CELL and _dot_satisfied(v, w, dot))
+     for v in range(MAX_VALUE + 1)]
+    for dot in (NO_DOT, WHITE_DOT, BLACK_DOT)
+]
+
+# NEIGHBOR_LEGAL[dot][w] is the mask of digits allowed next to a neighbor holding w
+# across the dot; an empty neighbor (w == EMPTY_CELL) allows every digit
+NEIGHBOR_LEGAL = [
+    [ALL_DIGITS_MASK if w == EMPTY_CELL else DOT_OK[dot][w] for w in range(MAX_VALUE + 1)]
+    for dot in (NO_DOT, WHITE_DOT, BLACK_DOT)
+]
+
+# Arc-consistency supports between orthogonally adjacent cells:
+# ADJACENT_SUPPORT[dot][mask] is the mask of digits v that have some digit w != v
+# in `mask` compatible with v across the dot
+ADJACENT_SUPPORT = [
+    [
+        sum(1 << v for v in VALID_DIGITS if DOT_OK[dot][v] & mask & ~(1 << v))
+        for mask in range(ALL_DIGITS_MASK + 1)
+    ]
+    for dot in (NO_DOT, WHITE_DOT, BLACK_DOT)
+]
@@ -11,6 +11,7 @@ File Format:
     [vertical_dots]
     8 lines of 9 space-separated values (0=none, 1=white, 2=black)
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Set
 
@@ -67,25 +68,30 @@ def verify_initial_board(board: Board) -> None:
     """
     Verify that the initial board state is valid.
     
+    Values are replayed one by one onto an empty board sharing the same dots,
+    so every clue is checked against the clues placed before it. This also
+    catches repeated digits, which cancel out in the board's XOR bitmasks.
+    
     Raises:
         ValueError: If the board violates any constraints
     """
+    check_board = Board()
+    check_board.dot_edges = board.dot_edges
+    
     # Check initial values don't violate Sudoku rules
     for row in range(GRID_SIZE):
         for col in range(GRID_SIZE):
             value = board.get_value(row, col)
             if value != EMPTY_CELL:
-                # Temporarily set cell to empty to check if value would be valid here
-                board.set_value(row, col, EMPTY_CELL)
-                if not is_valid_sudoku_move(board, row, col, value):
+                if not is_valid_sudoku_move(check_board, row, col, value):
                     raise ValueError(
                         f"Initial value {value} at ({row}, {col}) violates Sudoku rules"
                     )
-                if not is_valid_dot_move(board, row, col, value):
+                if not is_valid_dot_move(check_board, row, col, value):
                     raise ValueError(
                         f"Initial value {value} at ({row}, {col}) violates dot constraints"
                     )
-                board.set_value(row, col, value)
+                check_board.set_value(row, col, value)
 
 def load_puzzle(file_path: str) -> Board:
     """
@@ -104,7 +110,18 @@ def load_puzzle(file_path: str) -> Board:
     file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"Input file not found: {file_path}")
-        
+    
+    # Hand out a copy so callers can't mutate the cached board
+    return _read_puzzle(str(file_path), file_path.stat().st_mtime_ns).copy()
+
+@lru_cache(maxsize=64)
+def _read_puzzle(file_path: str, mtime_ns: int) -> Board:
+    """
+    Parse and verify a puzzle file, cached by path and modification time.
+    
+    Raises:
+        ValueError: If file format is invalid or initial state is invalid
+    """
     board = Board()
     line_num = 0
     
@@ -162,10 +179,8 @@ def save_solution(board: Board, file_path: str) -> None:
     if not board.is_complete():
         raise ValueError("Cannot save incomplete solution")
         
+    # Build the grid text once and write it in a single call
+    content = '\n'.join(' '.join(map(str, board.get_row(row))) for row in range(GRID_SIZE))
     with open(file_path, 'w') as f:
-        # Write grid only
-        for row in range(GRID_SIZE):
-            f.write(' '.join(str(x) for x in board.get_row(row)))
-            if row < GRID_SIZE - 1:
-                f.write('\n')
+        f.write(content)
   
\ No newline at end of file
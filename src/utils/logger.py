@@ -3,7 +3,7 @@ Logging configuration for the Kropki Sudoku solver.
 """
 import logging
 import sys
-from typing import Dict
+from typing import Dict, Optional
 
 # ANSI color codes
 COLORS: Dict[str, str] = {
@@ -15,34 +15,73 @@ COLORS: Dict[str, str] = {
     'RESET': '\033[0m'       # Reset
 }
 
+# Multiline messages are logged on a single line
+_NL_TABLE = str.maketrans({'\n': ' '})
+
 class ColorFormatter(logging.Formatter):
     """Custom formatter that adds colors and consistent formatting."""
     
+    def __init__(self, fmt: Optional[str] = None, use_color: bool = True) -> None:
+        """
+        Args:
+            fmt: %-style format string for the record
+            use_color: Wrap the level indicator and message in ANSI colors
+        """
+        super().__init__(fmt)
+        self._use_color = use_color
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record with colors."""
         # Handle separator differently
         if getattr(record, 'separator', False):
             return ""
-            
-        # Get color for this level
-        color = COLORS.get(record.levelname, '')
-        reset = COLORS['RESET']
-        
-        # Color the level indicator
-        level_indicator = f"{color}[{record.levelname}]{reset}"
-        record.levelname = level_indicator
+        return super().format(record)
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """Format the record's message, leaving the record itself untouched."""
+        levelname = record.levelname
+        message = record.message  # Set once by format() via getMessage()
+        if '\n' in message:
+            message = message.translate(_NL_TABLE)
         
-        # Color the message if it exists
-        if record.msg:
-            record.msg = f"{color}{str(record.msg).replace('\n', ' ')}{reset}"
+        if self._use_color:
+            # Color the level indicator, and the message if it exists
+            color = COLORS.get(levelname, '')
+            reset = COLORS['RESET']
+            levelname = f"{color}[{levelname}]{reset}"
+            if message:
+                message = f"{color}{message}{reset}"
+        else:
+            levelname = f"[{levelname}]"
         
-        return super().format(record)
+        return self._fmt % {**record.__dict__, 'levelname': levelname, 'message': message}
 
 class SeparatorLogger(logging.Logger):
     """Custom logger with additional functionality."""
     
-    def separator(self) -> None:
-        """Log an empty line for visual separation."""
+    def separator(self, legacy: bool = False) -> None:
+        """
+        Log an empty line for visual separation.
+        
+        Args:
+            legacy: Send a separator record through the logging machinery (filters)
+                instead of writing the line to the handlers' streams directly
+        """
+        if not legacy:
+            if self.isEnabledFor(logging.INFO) and not self.disabled:
+                # Same handlers a record would reach: this logger's, then its
+                # parents' for as long as propagation is enabled
+                logger = self
+                while logger:
+                    for handler in logger.handlers:
+                        if isinstance(handler, logging.StreamHandler) and handler.level <= logging.INFO:
+                            handler.stream.write(handler.terminator)
+                            handler.flush()
+                    if not logger.propagate:
+                        break
+                    logger = logger.parent
+            return
+        
         record = logging.LogRecord(
             name=self.name,
             level=logging.INFO,
@@ -67,10 +106,18 @@ class ColorHandler(logging.StreamHandler):
         except Exception:
             self.handleError(record)
 
+# Register our custom logger class
+logging.setLoggerClass(SeparatorLogger)
+
+# Loggers already configured by setup_logger, by name
+_configured: Dict[str, SeparatorLogger] = {}
+
 def setup_logger(name: str, level: int = logging.INFO) -> SeparatorLogger:
     """
     Set up a logger with colored console output.
     
+    Each name is configured once; later calls return the same logger unchanged.
+    
     Args:
         name: Logger name
         level: Initial logging level (default: INFO)
@@ -78,8 +125,8 @@ def setup_logger(name: str, level: int = logging.INFO) -> SeparatorLogger:
     Returns:
         SeparatorLogger: Configured logger with separator functionality
     """
-    # Register our custom logger class
-    logging.setLoggerClass(SeparatorLogger)
+    if name in _configured:
+        return _configured[name]
     
     logger = logging.getLogger(name)
     logger.setLevel(level)  # Set initial level
@@ -88,12 +135,13 @@ def setup_logger(name: str, level: int = logging.INFO) -> SeparatorLogger:
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
     
-    # Create formatters
-    console_formatter = ColorFormatter('%(levelname)s %(message)s')
+    # Create formatters; colors only make sense on a terminal
+    console_formatter = ColorFormatter('%(levelname)s %(message)s', use_color=sys.stdout.isatty())
     
     # Use our custom handler instead of StreamHandler
     console_handler = ColorHandler(sys.stdout)
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
     
+    _configured[name] = logger
     return logger
\ No newline at end of file
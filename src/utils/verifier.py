@@ -18,43 +18,55 @@ from src.utils.io_handler import load_puzzle
 from src.utils.logger import setup_logger
 from src.utils.constants import (
     GRID_SIZE, BLOCK_SIZE, WHITE_DOT, BLACK_DOT, NO_DOT,
-    MIN_VALUE, MAX_VALUE
+    MIN_VALUE, MAX_VALUE, DOT_OK
 )
 
-logger = setup_logger(__name__)
+# Configured in main() when run as a script
+logger = logging.getLogger(__name__)
 
-def verify_sudoku_rules(solution: np.ndarray) -> bool:
-    """Verify basic Sudoku rules (1-9 in each row, column, and block)."""
-    valid = True
-    required_set = set(range(MIN_VALUE, MAX_VALUE + 1))
+# Any valid row, column or block sorts to exactly this
+CANON = np.arange(MIN_VALUE, MAX_VALUE + 1)
+
+# (row, col) of the first cell of every horizontal and vertical dot pair
+H_PAIRS = [(row, col) for row in range(GRID_SIZE) for col in range(GRID_SIZE - 1)]
+V_PAIRS = [(row, col) for row in range(GRID_SIZE - 1) for col in range(GRID_SIZE)]
 
+def verify_sudoku_rules(solution: np.ndarray, fail_fast: bool = True) -> bool:
+    """
+    Verify basic Sudoku rules (1-9 in each row, column, and block).
+    
+    Args:
+        solution: The solved grid
+        fail_fast: Stop at the first invalid unit, unless debug logging is enabled
+    """
     logger.info("Checking Sudoku rules...")
+    stop = fail_fast and not logger.isEnabledFor(logging.DEBUG)
 
-    # Check rows
-    for row in range(GRID_SIZE):
-        row_vals = set(solution[row])
-        if row_vals != required_set:
-            logger.error(f"Row {row + 1} contains invalid values: {sorted(row_vals)}")
-            valid = False
+    # A unit is valid exactly when its sorted values equal 1..9
+    blocks = solution.reshape(BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE).swapaxes(1, 2).reshape(GRID_SIZE, GRID_SIZE)
+    rows_ok = (np.sort(solution, axis=1) == CANON).all(axis=1)
+    cols_ok = (np.sort(solution.T, axis=1) == CANON).all(axis=1)
+    blocks_ok = (np.sort(blocks, axis=1) == CANON).all(axis=1)
 
-    # Check columns
-    for col in range(GRID_SIZE):
-        col_vals = set(solution[:, col])
-        if col_vals != required_set:
-            logger.error(f"Column {col + 1} contains invalid values: {sorted(col_vals)}")
-            valid = False
+    if rows_ok.all() and cols_ok.all() and blocks_ok.all():
+        return True
 
-    # Check blocks
-    for block_row in range(BLOCK_SIZE):
-        for block_col in range(BLOCK_SIZE):
-            start_row = block_row * BLOCK_SIZE
-            start_col = block_col * BLOCK_SIZE
-            block_vals = set(solution[start_row:start_row+BLOCK_SIZE, start_col:start_col+BLOCK_SIZE].flatten())
-            if block_vals != required_set:
-                logger.error(f"Block ({block_row+1},{block_col+1}) contains invalid values: {sorted(block_vals)}")
-                valid = False
+    # Report the offending units
+    for row in np.flatnonzero(~rows_ok):
+        logger.error(f"Row {row + 1} contains invalid values: {np.unique(solution[row]).tolist()}")
+        if stop:
+            return False
+    for col in np.flatnonzero(~cols_ok):
+        logger.error(f"Column {col + 1} contains invalid values: {np.unique(solution[:, col]).tolist()}")
+        if stop:
+            return False
+    for block in np.flatnonzero(~blocks_ok):
+        block_row, block_col = divmod(int(block), BLOCK_SIZE)
+        logger.error(f"Block ({block_row+1},{block_col+1}) contains invalid values: {np.unique(blocks[block]).tolist()}")
+        if stop:
+            return False
 
-    return valid
+    return False
 
 def verify_white_dot(val1: int, val2: int, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
     """
@@ -62,7 +74,7 @@ def verify_white_dot(val1: int, val2: int, pos1: Tuple[int, int], pos2: Tuple[in
     the value in the other cell. This can be satisfied in either direction.
     """
     if abs(val1 - val2) == 1:
-        logger.debug(f"White dot constraint satisfied between {pos1} ({val1}) and {pos2} ({val2})")
+        logger.debug("White dot constraint satisfied between %s (%s) and %s (%s)", pos1, val1, pos2, val2)
         return True
     logger.error(f"White dot constraint violated between {pos1} ({val1}) and {pos2} ({val2})")
     return False
@@ -73,7 +85,7 @@ def verify_black_dot(val1: int, val2: int, pos1: Tuple[int, int], pos2: Tuple[in
     the value in the other cell. This can be satisfied in either direction.
     """
     if val1 == 2 * val2 or val2 == 2 * val1:
-        logger.debug(f"Black dot constraint satisfied between {pos1} ({val1}) and {pos2} ({val2})")
+        logger.debug("Black dot constraint satisfied between %s (%s) and %s (%s)", pos1, val1, pos2, val2)
         return True
     logger.error(f"Black dot constraint violated between {pos1} ({val1}) and {pos2} ({val2})")
     return False
@@ -88,7 +100,7 @@ def verify_no_dot(val1: int, val2: int, pos1: Tuple[int, int], pos2: Tuple[int,
     has_black_dot = val1 == 2 * val2 or val2 == 2 * val1
     
     if not has_white_dot and not has_black_dot:
-        logger.debug(f"No-dot constraint satisfied between {pos1} ({val1}) and {pos2} ({val2})")
+        logger.debug("No-dot constraint satisfied between %s (%s) and %s (%s)", pos1, val1, pos2, val2)
         return True
         
     if has_white_dot:
@@ -97,61 +109,143 @@ def verify_no_dot(val1: int, val2: int, pos1: Tuple[int, int], pos2: Tuple[int,
         logger.error(f"No-dot constraint violated: double relationship between {pos1} ({val1}) and {pos2} ({val2})")
     return False
 
-def verify_dot_constraints(board: Board, solution: np.ndarray) -> bool:
-    """Verify all dot constraints."""
+def verify_dot(dot: int, val1: int, val2: int, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
+    """Verify the constraint of a single dot (or absence of dot) between two cells."""
+    if dot == WHITE_DOT:
+        return verify_white_dot(val1, val2, pos1, pos2)
+    if dot == BLACK_DOT:
+        return verify_black_dot(val1, val2, pos1, pos2)
+    if dot == NO_DOT:
+        return verify_no_dot(val1, val2, pos1, pos2)
+    logger.error(f"Invalid dot value: {dot}")
+    return False
+
+def dot_violations(val1: np.ndarray, val2: np.ndarray, dots: np.ndarray) -> np.ndarray:
+    """
+    Flag the cell pairs that violate the dot between them.
+    
+    Args:
+        val1, val2: Values of the first and second cell of each pair
+        dots: Dot value between each pair, same shape as the values
+        
+    Returns:
+        np.ndarray: Boolean array, True where the pair violates its dot
+    """
+    white = np.abs(val1 - val2) == 1
+    black = (val1 == 2 * val2) | (val2 == 2 * val1)
+    satisfied = (((dots == WHITE_DOT) & white) |
+                 ((dots == BLACK_DOT) & black) |
+                 ((dots == NO_DOT) & ~(white | black)))
+    return ~satisfied
+
+def verify_dot_constraints(board: Board, solution: np.ndarray, jit: bool = False,
+                           fail_fast: bool = True) -> bool:
+    """
+    Verify all dot constraints.
+    
+    All pairs are checked at once (with NumPy, or the Numba-compiled kernel),
+    and only the violating ones are reported, unless debug logging asks for every pair.
+    
+    Args:
+        board: The original puzzle, providing the dots
+        solution: The solved grid
+        jit: Sweep the dots in the Numba-compiled kernel (requires numba)
+        fail_fast: Stop at the first violated dot, unless debug logging is enabled
+    """
     valid = True
+    stop = fail_fast and not logger.isEnabledFor(logging.DEBUG)
 
     logger.info("Checking dot constraints...")
 
+    hdots = np.array(board.get_horizontal_dots(), dtype=np.int16)
+    vdots = np.array(board.get_vertical_dots(), dtype=np.int16)
+    if jit:
+        from src.utils import _nb
+        h_bad, v_bad = _nb.check_dots(solution, hdots, vdots)
+    else:
+        h_bad = dot_violations(solution[:, :-1], solution[:, 1:], hdots)
+        v_bad = dot_violations(solution[:-1, :], solution[1:, :], vdots)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        h_pairs = H_PAIRS
+        v_pairs = V_PAIRS
+    elif h_bad.any() or v_bad.any():
+        h_pairs = np.argwhere(h_bad).tolist()
+        v_pairs = np.argwhere(v_bad).tolist()
+    else:
+        return True
+
     # Check horizontal dots
     logger.debug("Checking horizontal dots...")
-    for row in range(GRID_SIZE):
-        for col in range(GRID_SIZE - 1):
-            val1 = solution[row, col]
-            val2 = solution[row, col + 1]
-            pos1 = (row + 1, col + 1)
-            pos2 = (row + 1, col + 2)
-            dot = board.get_horizontal_dot(row, col)
-
-            if dot == WHITE_DOT:
-                valid &= verify_white_dot(val1, val2, pos1, pos2)
-            elif dot == BLACK_DOT:
-                valid &= verify_black_dot(val1, val2, pos1, pos2)
-            elif dot == NO_DOT:
-                valid &= verify_no_dot(val1, val2, pos1, pos2)
-            else:
-                logger.error(f"Invalid dot value: {dot}")
-                valid = False
+    for row, col in h_pairs:
+        if not verify_dot(board.get_horizontal_dot(row, col), solution[row, col], solution[row, col + 1],
+                          (row + 1, col + 1), (row + 1, col + 2)):
+            valid = False
+            if stop:
+                return False
 
     # Check vertical dots
     logger.debug("Checking vertical dots...")
-    for row in range(GRID_SIZE - 1):
-        for col in range(GRID_SIZE):
-            val1 = solution[row, col]
-            val2 = solution[row + 1, col]
-            pos1 = (row + 1, col + 1)
-            pos2 = (row + 2, col + 1)
-            dot = board.get_vertical_dot(row, col)
-
-            if dot == WHITE_DOT:
-                valid &= verify_white_dot(val1, val2, pos1, pos2)
-            elif dot == BLACK_DOT:
-                valid &= verify_black_dot(val1, val2, pos1, pos2)
-            elif dot == NO_DOT:
-                valid &= verify_no_dot(val1, val2, pos1, pos2)
-            else:
-                logger.error(f"Invalid dot value: {dot}")
-                valid = False
+    for row, col in v_pairs:
+        if not verify_dot(board.get_vertical_dot(row, col), solution[row, col], solution[row + 1, col],
+                          (row + 1, col + 1), (row + 2, col + 1)):
+            valid = False
+            if stop:
+                return False
 
     return valid
 
-def verify_solution(input_file: Path, solution_file: Path) -> bool:
+def verify_grid(board: Board, solution: np.ndarray) -> bool:
+    """
+    Check Sudoku rules and dot constraints together in a single pass, without reporting.
+    
+    Each cell is checked against the row, column and block digits seen so far and
+    against the dots toward its already visited left and upper neighbors.
+    
+    Args:
+        board: The original puzzle, providing the dots
+        solution: The solved grid
+        
+    Returns:
+        bool: True if every constraint is satisfied
+    """
+    logger.info("Checking Sudoku rules and dot constraints...")
+    
+    values = solution.ravel().tolist()
+    row_mask = [0] * GRID_SIZE
+    col_mask = [0] * GRID_SIZE
+    block_mask = [0] * GRID_SIZE
+    dot_edges = board.dot_edges
+    
+    for idx, value in enumerate(values):
+        if not MIN_VALUE <= value <= MAX_VALUE:
+            return False
+        row, col = divmod(idx, GRID_SIZE)
+        block = (row // BLOCK_SIZE) * BLOCK_SIZE + col // BLOCK_SIZE
+        bit = 1 << value
+        if (row_mask[row] | col_mask[col] | block_mask[block]) & bit:
+            return False
+        row_mask[row] |= bit
+        col_mask[col] |= bit
+        block_mask[block] |= bit
+        
+        for neighbor, dot in dot_edges[idx].items():
+            if neighbor < idx and not (DOT_OK[dot][value] >> values[neighbor]) & 1:
+                return False
+    
+    # Nine distinct digits from 1..9 in every unit means every unit is complete
+    return True
+
+def verify_solution(input_file: Path, solution_file: Path, jit: bool = False,
+                    fail_fast: bool = True) -> bool:
     """
     Verify if a solution satisfies all Kropki Sudoku constraints.
     
     Args:
         input_file: Path to the input puzzle file
         solution_file: Path to the solution file
+        jit: Check dot constraints in the Numba-compiled kernel (requires numba)
+        fail_fast: Report only the first violation, unless debug logging is enabled
         
     Returns:
         bool: True if all constraints are satisfied
@@ -178,13 +272,19 @@ def verify_solution(input_file: Path, solution_file: Path) -> bool:
             logger.debug("Reading solution file...")
             with open(solution_file, 'r') as f:
                 content = f.read().strip()
-                logger.debug(f"Solution content: {content[:50]}...")
+                logger.debug("Solution content: %s...", content[:50])
                 if not content:
                     logger.error(f"Solution file is empty: {solution_file}")
                     return False
+            # Every line must hold one full grid row; the values are then parsed
+            # from the text already read in one C-level scan
             logger.debug("Parsing solution as numpy array...")
-            solution = np.loadtxt(solution_file, dtype=int)
-            logger.debug(f"Solution shape: {solution.shape}")
+            line_lengths = [len(line.split()) for line in content.splitlines()]
+            if any(length != GRID_SIZE for length in line_lengths):
+                raise ValueError(f"every line must hold {GRID_SIZE} values, got {line_lengths}")
+            values = np.fromstring(content, dtype=int, sep=' ')
+            solution = values.reshape(len(line_lengths), GRID_SIZE)
+            logger.debug("Solution shape: %s", solution.shape)
         except ValueError as e:
             logger.error(f"Invalid data in solution file: {str(e)}")
             return False
@@ -197,8 +297,17 @@ def verify_solution(input_file: Path, solution_file: Path) -> bool:
             logger.error(f"Invalid solution shape: {solution.shape}")
             return False
             
-        sudoku_valid = verify_sudoku_rules(solution)
-        dots_valid = verify_dot_constraints(board, solution)
+        # Fused pass first; the separate checks only run to report what failed,
+        # to show every check when debugging, or to use the jit kernel
+        if not jit and not logger.isEnabledFor(logging.DEBUG) and verify_grid(board, solution):
+            logger.info("✓ All constraints satisfied!")
+            return True
+        
+        sudoku_valid = verify_sudoku_rules(solution, fail_fast=fail_fast)
+        if sudoku_valid or not fail_fast or logger.isEnabledFor(logging.DEBUG):
+            dots_valid = verify_dot_constraints(board, solution, jit=jit, fail_fast=fail_fast)
+        else:
+            dots_valid = False
         
         if sudoku_valid and dots_valid:
             logger.info("✓ All constraints satisfied!")
@@ -214,19 +323,32 @@ def verify_solution(input_file: Path, solution_file: Path) -> bool:
         return False
 
 def main():
-    """Verify all solutions in output/basic and output/forward_checking directories."""
+    """Verify all solutions in output/basic, output/forward_checking and output/arc_consistency directories."""
     parser = argparse.ArgumentParser(description="Verify Kropki Sudoku solutions")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging", default=False)
+    parser.add_argument("--jit", action="store_true", help="Check dot constraints with the Numba-compiled kernel")
+    parser.add_argument("--all-errors", action="store_true",
+                        help="Report every violation instead of stopping at the first one")
     args = parser.parse_args()
 
+    setup_logger(__name__)
+    setup_logger("src")  # Loggers of the modules used for verification
+
     # Set logging level based on debug flag
     if args.debug:
         logger.setLevel(logging.DEBUG)
+
+    if args.jit:
+        try:
+            from src.utils import _nb
+        except ImportError:
+            logger.error("--jit requires numba (pip install -r requirements-jit.txt)")
+            return 1
     
     logger.info("Starting verification process...")
     
     # Check both output directories
-    output_dirs = [Path("output/basic"), Path("output/forward_checking")]
+    output_dirs = [Path("output/basic"), Path("output/forward_checking"), Path("output/arc_consistency")]
     data_dir = Path("data")
     
     total_verified = 0
@@ -241,7 +363,7 @@ def main():
         logger.info(f"Checking solutions in {output_dir}")
         try:
             solution_files = sorted(list(output_dir.glob("Output*.txt")))
-            logger.debug(f"Found {len(solution_files)} solution files in {output_dir}")
+            logger.debug("Found %d solution files in %s", len(solution_files), output_dir)
         except Exception as e:
             logger.error(f"Error listing directory {output_dir}: {str(e)}")
             continue
@@ -254,16 +376,16 @@ def main():
                 # Extract number from Output*.txt and find corresponding Input*.txt
                 input_num = solution_file.name.replace("Output", "").replace(".txt", "")
                 input_file = data_dir / f"Input{input_num}.txt"
-                logger.debug(f"Processing solution file: {solution_file}")
-                logger.debug(f"Corresponding input file: {input_file}")
+                logger.debug("Processing solution file: %s", solution_file)
+                logger.debug("Corresponding input file: %s", input_file)
                 
                 if not input_file.exists():
                     logger.error(f"Could not find input file for {solution_file}")
                     continue
                 
                 # Verify the solution
-                result = verify_solution(input_file, solution_file)
-                logger.debug(f"Verification result: {result}")
+                result = verify_solution(input_file, solution_file, jit=args.jit, fail_fast=not args.all_errors)
+                logger.debug("Verification result: %s", result)
                 dir_total += 1
                 total_verified += 1
                 
@@ -0,0 +1,55 @@
+"""
+Random Kropki Sudoku puzzles for the tests.
+
+A random valid grid is obtained by shuffling a base solution (bands, stacks,
+rows and columns within them, digit relabeling and transposition). Its dots
+are derived from the grid itself, so every generated puzzle is solvable.
+"""
+import random
+from typing import Iterable, List
+
+from src.models.board import Board
+from src.utils.constants import GRID_SIZE, BLOCK_SIZE, CELL_COUNT, NO_DOT, WHITE_DOT, BLACK_DOT
+
+BASE = [[(row * BLOCK_SIZE + row // BLOCK_SIZE + col) % GRID_SIZE + 1 for col in range(GRID_SIZE)]
+        for row in range(GRID_SIZE)]
+
+def random_solution(rng: random.Random) -> List[List[int]]:
+    """A random valid Sudoku grid."""
+    rows = [band * BLOCK_SIZE + row for band in rng.sample(range(BLOCK_SIZE), BLOCK_SIZE)
+            for row in rng.sample(range(BLOCK_SIZE), BLOCK_SIZE)]
+    cols = [stack * BLOCK_SIZE + col for stack in rng.sample(range(BLOCK_SIZE), BLOCK_SIZE)
+            for col in rng.sample(range(BLOCK_SIZE), BLOCK_SIZE)]
+    digits = rng.sample(range(1, GRID_SIZE + 1), GRID_SIZE)
+    grid = [[digits[BASE[row][col] - 1] for col in cols] for row in rows]
+    if rng.random() < 0.5:
+        grid = [list(col) for col in zip(*grid)]
+    return grid
+
+def dot_between(val1: int, val2: int, rng: random.Random) -> int:
+    """A dot satisfied by two values (1 and 2 may get either dot)."""
+    white = abs(val1 - val2) == 1
+    black = val1 == 2 * val2 or val2 == 2 * val1
+    if white and black:
+        return rng.choice((WHITE_DOT, BLACK_DOT))
+    if white:
+        return WHITE_DOT
+    return BLACK_DOT if black else NO_DOT
+
+def puzzle_from_solution(solution: List[List[int]], rng: random.Random, clue_cells: Iterable[int]) -> Board:
+    """A puzzle with the dots of a solution and its values at the given flat indices as clues."""
+    board = Board()
+    for row in range(GRID_SIZE):
+        for col in range(GRID_SIZE - 1):
+            board.set_horizontal_dot(row, col, dot_between(solution[row][col], solution[row][col + 1], rng))
+    for row in range(GRID_SIZE - 1):
+        for col in range(GRID_SIZE):
+            board.set_vertical_dot(row, col, dot_between(solution[row][col], solution[row + 1][col], rng))
+    for idx in clue_cells:
+        row, col = divmod(idx, GRID_SIZE)
+        board.set_value(row, col, solution[row][col])
+    return board
+
+def random_puzzle(rng: random.Random, clues: int) -> Board:
+    """A solvable puzzle with the given number of clues."""
+    return puzzle_from_solution(random_solution(rng), rng, rng.sample(range(CELL_COUNT), clues))
@@ -0,0 +1,19 @@
+"""
+Tests for the board's dot layout bookkeeping.
+"""
+from src.models.board import Board
+from src.utils.constants import BLACK_DOT, NO_DOT, WHITE_DOT
+
+def test_setting_dots_leaves_other_boards_alone():
+    board = Board()
+    board.set_horizontal_dot(0, 0, WHITE_DOT)
+    copy = board.copy()
+    copy.set_vertical_dot(0, 0, BLACK_DOT)
+    copy.set_horizontal_dot(0, 0, NO_DOT)
+
+    assert board.get_horizontal_dot(0, 0) == WHITE_DOT
+    assert board.get_vertical_dot(0, 0) == NO_DOT
+    assert copy.get_horizontal_dot(0, 0) == NO_DOT
+    assert copy.get_vertical_dot(0, 0) == BLACK_DOT
+    assert Board().get_horizontal_dot(0, 0) == NO_DOT
+    assert Board().get_vertical_dot(0, 0) == NO_DOT
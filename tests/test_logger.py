@@ -0,0 +1,31 @@
+"""
+Tests for the logging helpers.
+"""
+import io
+import logging
+
+from src.utils.logger import ColorFormatter, setup_logger
+
+def test_separator_reaches_parent_handlers(monkeypatch):
+    parent = setup_logger("separator_parent")
+    stream = io.StringIO()
+    monkeypatch.setattr(parent.handlers[0], "stream", stream)
+    parent.handlers[0].setFormatter(ColorFormatter('%(levelname)s %(message)s', use_color=False))
+    child = logging.getLogger("separator_parent.child")
+
+    child.info("before")
+    child.separator()
+    child.info("after")
+
+    assert stream.getvalue().splitlines() == ["[INFO] before", "", "[INFO] after"]
+
+def test_separator_respects_propagate(monkeypatch):
+    parent = setup_logger("separator_noprop")
+    stream = io.StringIO()
+    monkeypatch.setattr(parent.handlers[0], "stream", stream)
+    child = logging.getLogger("separator_noprop.child")
+    monkeypatch.setattr(child, "propagate", False)
+
+    child.separator()
+
+    assert stream.getvalue() == ""
@@ -0,0 +1,102 @@
+"""
+Tests for the backtracking solver in each of its modes.
+"""
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.models.board import Board
+from src.solver.solver import KropkiSolver
+from src.utils.constants import GRID_SIZE, WHITE_DOT
+from src.utils.io_handler import load_puzzle
+from src.utils.verifier import verify_grid
+from tests.puzzle_factory import random_puzzle
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+INPUT_FILES = sorted(DATA_DIR.glob("Input*.txt"))
+FUZZ_PUZZLES = 180
+
+MODES = {
+    "basic": {},
+    "forward_checking": {"forward_checking": True},
+    "arc_consistency": {"arc_consistency": True},
+    "lcv": {"lcv": True},
+    "arc_consistency_lcv": {"arc_consistency": True, "lcv": True},
+    "jit": {"jit": True},
+    "jit_forward_checking": {"jit": True, "forward_checking": True},
+}
+
+@pytest.fixture(params=list(MODES), ids=list(MODES))
+def solver(request):
+    """A solver for each mode; jit modes are skipped without numba."""
+    if MODES[request.param].get("jit"):
+        pytest.importorskip("numba")
+    return KropkiSolver(**MODES[request.param])
+
+def board_state(board: Board):
+    """Everything the search may touch, for comparing before and after."""
+    return (list(board.grid), list(board.row_mask), list(board.col_mask),
+            list(board.block_mask), board.empty_cells)
+
+def solve_and_check(solver: KropkiSolver, puzzle: Board) -> None:
+    """Solve a copy of the puzzle and check the result against the puzzle's clues and dots."""
+    board = puzzle.copy()
+    assert solver.solve(board)
+    assert board.is_complete()
+    solution = np.array(board.grid).reshape(GRID_SIZE, GRID_SIZE)
+    assert verify_grid(puzzle, solution)
+    clues = [(idx, value) for idx, value in enumerate(puzzle.grid) if value]
+    assert all(board.grid[idx] == value for idx, value in clues)
+
+@pytest.mark.parametrize("input_file", INPUT_FILES, ids=[f.name for f in INPUT_FILES])
+def test_solves_data_inputs(solver, input_file):
+    solve_and_check(solver, load_puzzle(str(input_file)))
+
+def test_solves_random_puzzles(solver):
+    rng = random.Random(2024)
+    for _ in range(FUZZ_PUZZLES):
+        solve_and_check(solver, random_puzzle(rng, rng.randint(15, 30)))
+
+def unsolvable_puzzle() -> Board:
+    """
+    A puzzle that is arc consistent but has no solution, so every mode has to search.
+    
+    Row 1 holds 7 4 9 5 8 6 in columns 4-9 and a 3 sits in block 1, leaving
+    the three empty cells of row 1 only 1 and 2 (white dots keep that pair allowed).
+    """
+    board = Board()
+    for col, value in zip(range(3, GRID_SIZE), (7, 4, 9, 5, 8, 6)):
+        board.set_value(0, col, value)
+    board.set_value(2, 1, 3)
+    board.set_horizontal_dot(0, 0, WHITE_DOT)
+    board.set_horizontal_dot(0, 1, WHITE_DOT)
+    return board
+
+def test_unsolvable_puzzle_leaves_board_unchanged(solver):
+    board = unsolvable_puzzle()
+    before = board_state(board)
+
+    assert not solver.solve(board)
+    assert solver.assignments > 0
+    assert solver.backtracks == solver.assignments
+    assert board_state(board) == before
+
+def test_arc_consistency_undo_restores_initial_domains():
+    initial = KropkiSolver(arc_consistency=True)
+    assert initial.init_domains(unsolvable_puzzle())
+
+    solver = KropkiSolver(arc_consistency=True)
+    assert not solver.solve(unsolvable_puzzle())
+    assert solver.domains == initial.domains
+    assert solver.trail == initial.trail
+
+def test_jit_without_numba_fails_at_construction(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numba", None)
+    monkeypatch.delitem(sys.modules, "src.solver._nb", raising=False)
+    monkeypatch.delattr("src.solver._nb", raising=False)
+
+    with pytest.raises(ImportError, match="requirements-jit.txt"):
+        KropkiSolver(jit=True)
@@ -0,0 +1,125 @@
+"""
+Tests for the solution verifier.
+"""
+import logging
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.solver.solver import KropkiSolver
+from src.utils.constants import GRID_SIZE
+from src.utils.io_handler import load_puzzle, save_solution
+from src.utils import verifier
+from src.utils.verifier import dot_violations, verify_dot_constraints, verify_grid, verify_solution, verify_sudoku_rules
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+@pytest.fixture
+def solved(tmp_path):
+    """Input1 and a correct solution file for it, as (input_file, solution_file)."""
+    input_file = DATA_DIR / "Input1.txt"
+    board = load_puzzle(str(input_file))
+    assert KropkiSolver(forward_checking=True).solve(board)
+    solution_file = tmp_path / "Output1.txt"
+    save_solution(board, str(solution_file))
+    return input_file, solution_file
+
+def test_accepts_correct_solution(solved):
+    assert verify_solution(*solved)
+
+def test_rejects_misplaced_line_break(solved):
+    input_file, solution_file = solved
+    lines = solution_file.read_text().splitlines()
+    # Move the first line break one value later: lines of 10, 8, 9, ..., 9 values
+    first, second = lines[0].split(), lines[1].split()
+    lines[0] = " ".join(first + second[:1])
+    lines[1] = " ".join(second[1:])
+    solution_file.write_text("\n".join(lines))
+    assert not verify_solution(input_file, solution_file)
+
+def rewrite_grid(solution_file, change):
+    """Apply change(grid) to the grid in a solution file, a list of rows of ints."""
+    grid = [[int(value) for value in line.split()] for line in solution_file.read_text().splitlines()]
+    change(grid)
+    solution_file.write_text("\n".join(" ".join(map(str, row)) for row in grid))
+
+def test_rejects_duplicate_digit(solved):
+    input_file, solution_file = solved
+    rewrite_grid(solution_file, lambda grid: grid[0].__setitem__(0, grid[0][1]))
+    assert not verify_solution(input_file, solution_file)
+
+def test_rejects_broken_dot(solved):
+    input_file, solution_file = solved
+    # Swapping two columns of a stack keeps the Sudoku rules but moves values across dots
+    def swap_columns(grid):
+        for row in grid:
+            row[0], row[1] = row[1], row[0]
+    rewrite_grid(solution_file, swap_columns)
+    solution = np.loadtxt(solution_file, dtype=int)
+    assert verify_sudoku_rules(solution)
+    assert not verify_solution(input_file, solution_file)
+
+def test_fail_fast_reports_only_first_violation(solved, caplog):
+    input_file, solution_file = solved
+    rewrite_grid(solution_file, lambda grid: grid[4].reverse())
+
+    with caplog.at_level(logging.ERROR):
+        assert not verify_solution(input_file, solution_file, fail_fast=True)
+    first = [record for record in caplog.records if record.levelno == logging.ERROR]
+    caplog.clear()
+    with caplog.at_level(logging.ERROR):
+        assert not verify_solution(input_file, solution_file, fail_fast=False)
+    every = [record for record in caplog.records if record.levelno == logging.ERROR]
+
+    # One violation plus the final failure message, against every violation
+    assert len(first) == 2
+    assert len(every) > len(first)
+
+def test_fused_pass_agrees_with_separate_checks(solved):
+    input_file, solution_file = solved
+    board = load_puzzle(str(input_file))
+    solution = np.loadtxt(solution_file, dtype=int)
+    assert verify_grid(board, solution)
+
+    rng = random.Random(5)
+    for _ in range(500):
+        grid = solution.copy()
+        for _ in range(rng.randint(1, 3)):
+            grid[rng.randrange(GRID_SIZE), rng.randrange(GRID_SIZE)] = rng.randint(0, 10)
+        separate = verify_sudoku_rules(grid) and verify_dot_constraints(board, grid, fail_fast=False)
+        assert verify_grid(board, grid) == separate
+
+
+def test_jit_dot_kernel_matches_numpy_checks(solved):
+    pytest.importorskip("numba")
+    from src.utils import _nb
+
+    input_file, solution_file = solved
+    board = load_puzzle(str(input_file))
+    hdots = np.array(board.get_horizontal_dots(), dtype=np.int16)
+    vdots = np.array(board.get_vertical_dots(), dtype=np.int16)
+    solution = np.loadtxt(solution_file, dtype=int)
+    rng = random.Random(11)
+    for _ in range(200):
+        grid = solution.copy()
+        for _ in range(rng.randint(0, 4)):
+            grid[rng.randrange(GRID_SIZE), rng.randrange(GRID_SIZE)] = rng.randint(1, 9)
+        h_bad, v_bad = _nb.check_dots(grid, hdots, vdots)
+        assert (h_bad == dot_violations(grid[:, :-1], grid[:, 1:], hdots)).all()
+        assert (v_bad == dot_violations(grid[:-1, :], grid[1:, :], vdots)).all()
+
+
+def test_jit_without_numba_exits_before_verifying(monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, "numba", None)
+    monkeypatch.delitem(sys.modules, "src.utils._nb", raising=False)
+    monkeypatch.delattr("src.utils._nb", raising=False)
+    monkeypatch.setattr(sys, "argv", ["verifier.py", "--jit"])
+
+    assert verifier.main() == 1
+    assert [record.message for record in caplog.records if record.levelno >= logging.ERROR] == [
+        "--jit requires numba (pip install -r requirements-jit.txt)"
+    ]
+    assert "Starting verification process..." not in caplog.messages